@@ -19,6 +19,7 @@ Nom du fichier image de sortie (ex: maze.png): maze.png
 Taille d'une cellule (pixels) [10]: 10
 """
 
+import numpy as np
 from PIL import Image
 
 # Color mapping
@@ -29,24 +30,44 @@ COLORS = {
     '*': (200, 200, 200),   # explored but not path = gray
 }
 
+# Indexed palette: index -> RGB color (unknown chars fall back to white)
+PALETTE_KEYS = list(COLORS)
+PALETTE = np.array([COLORS[ch] for ch in PALETTE_KEYS], dtype=np.uint8)
+DEFAULT_INDEX = PALETTE_KEYS.index('.')
+
+# ASCII code -> palette index
+LOOKUP = np.full(256, DEFAULT_INDEX, dtype=np.uint8)
+LOOKUP[[ord(ch) for ch in PALETTE_KEYS]] = np.arange(len(PALETTE_KEYS))
+
+# Number of maze rows rendered per band in maze_to_image
+BAND_ROWS = 32
+
 def load_ascii(filename):
-    """Load an ASCII maze from file into a list of lists."""
-    with open(filename, 'r', encoding='utf-8') as f:
-        lines = [list(line.rstrip('\n')) for line in f if line.strip() != '' or line == '\n']
-    return lines
+    """Load an ASCII maze from file into a 2D uint8 array (one ASCII code per cell)."""
+    with open(filename, 'rb') as f:
+        lines = [line for line in f.read().splitlines() if line]
+    W = len(lines[0])
+    return np.frombuffer(b''.join(lines), dtype=np.uint8).reshape(-1, W).copy()
+
+def load_ascii_lists(filename):
+    """Load an ASCII maze from file into a list of lists of chars (legacy API)."""
+    return load_ascii(filename).view('S1').astype('U1').tolist()
 
 def maze_to_image(grid, cell_size=10, filename="maze.png"):
-    """Convert an ASCII maze grid to an image and save it."""
-    H, W = len(grid), len(grid[0])
-    img = Image.new("RGB", (W * cell_size, H * cell_size), "white")
-    pixels = img.load()
-
-    for r in range(H):
-        for c in range(W):
-            color = COLORS.get(grid[r][c], (255, 255, 255))
-            for y in range(r * cell_size, (r + 1) * cell_size):
-                for x in range(c * cell_size, (c + 1) * cell_size):
-                    pixels[x, y] = color
+    """Convert an ASCII maze grid (uint8 array or list of lists) to an image and save it."""
+    if not isinstance(grid, np.ndarray):
+        codes = np.array([[ord(ch) for ch in row] for row in grid], dtype=np.int64)
+        # Chars beyond U+00FF have no LOOKUP entry: render them like other unknown chars (white)
+        grid = np.where(codes < 256, codes, ord(PALETTE_KEYS[DEFAULT_INDEX])).astype(np.uint8)
+    H, W = grid.shape
+    img = Image.new("RGB", (W * cell_size, H * cell_size))
+
+    # Process BAND_ROWS maze rows at a time so only one upsampled band is in memory
+    for r0 in range(0, H, BAND_ROWS):
+        # (rows, W, 3), then upsample each cell into a cell_size x cell_size block
+        small = PALETTE[LOOKUP[grid[r0:r0 + BAND_ROWS]]]
+        band = np.repeat(np.repeat(small, cell_size, axis=0), cell_size, axis=1)
+        img.paste(Image.fromarray(band, 'RGB'), (0, r0 * cell_size))
 
     img.save(filename)
     print(f"✅ Image sauvegardée dans '{filename}'")
@@ -10,7 +10,15 @@ Automatise la comparaison des **générateurs** et **solveurs** :
 Mesures collectées
 ------------------
 - Temps réel (wall_time_s) et CPU (cpu_time_s)
-- Mémoire peak (peak_mem_bytes, via tracemalloc)
+- Mémoire peak (peak_mem_bytes) : sous Linux, pic RSS pendant l'appel moins le RSS
+  avant l'appel (VmHWM remis à zéro via /proc/self/clear_refs ; à défaut, RSS courant
+  après moins avant, ce qui ignore la mémoire libérée avant le retour).
+  Ailleurs (macOS...) : croissance de ru_maxrss (getrusage) pendant l'appel, ou RSS
+  après moins avant via psutil si getrusage est absent (Windows).
+  Avec --precise-mem : pic tracemalloc (par allocation Python/numpy, mais ralentit le
+  code mesuré)
+- La mesure mémoire est démarrée avant et arrêtée après la prise des temps : son coût
+  (lecture de /proc, appels système) n'est pas compté dans wall_time_s / cpu_time_s.
 - Dimensions ASCII, taille du texte (ascii_bytes)
 - Longueur du chemin trouvé (path_len_cells) et cases explorées (explored_cells)
 
@@ -31,6 +39,13 @@ Notes
     - maze_generator.py  (carve_passages_recursive_backtracking, carve_maze_kruskal)
     - maze_solver.py     (solve_backtracking, solve_astar)
 - Place benchmarks.py dans le même dossier que ces fichiers, ou ajoute leur chemin via PYTHONPATH.
+- Les runs indépendants (n, rep, générateur) sont répartis sur --jobs processus
+  (par défaut: nombre de CPU) ; --jobs 1 exécute tout dans le processus courant.
+- Avant les mesures, chaque processus (principal avec --jobs 1, sinon chaque worker via
+  l'initializer du pool) appelle une fois chaque générateur/solveur sur n=1 (warm_up) :
+  la compilation JIT / le chargement du cache numba ne sont pas comptés dans wall_time_s.
+- Lancer `python build_kernels.py` une fois au préalable compile les noyaux numba à l'avance,
+  ce qui rend ce préchauffage quasi instantané.
 """
 
 import argparse
@@ -38,13 +53,25 @@ import importlib
 import sys
 import time
 import tracemalloc
-from dataclasses import dataclass, asdict
-from typing import Callable, Dict, List, Tuple
-from collections import Counter
+from dataclasses import dataclass, asdict, fields
+from typing import Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import csv
 import os
 import math
 
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 # ---------------------------------
 # Types / constantes
 # ---------------------------------
@@ -53,23 +80,97 @@ EMPTY = '.'
 PATH  = 'o'
 SEEN  = '*'
 
-Grid = List[List[str]]
+Grid = np.ndarray  # (H, W) uint8 de codes ASCII
 
 # ---------------------------------
 # Utils
 # ---------------------------------
+def as_u8(grid) -> Grid:
+    """Grille sous forme de tableau uint8 (codes ASCII) ; accepte aussi une liste de listes de caractères."""
+    if isinstance(grid, np.ndarray):
+        return grid.astype(np.uint8, copy=False)
+    return np.array([[ord(ch) for ch in row] for row in grid], dtype=np.uint8)
+
 def grid_to_str(grid: Grid) -> str:
-    return "\n".join("".join(row) for row in grid)
+    # Ajoute une colonne de '\n' puis décode le tout en une fois (sans le dernier '\n')
+    H, W = grid.shape
+    buf = np.empty((H, W + 1), dtype=np.uint8)
+    buf[:, :W] = grid
+    buf[:, W] = ord("\n")
+    return buf.tobytes()[:-1].decode("ascii")
 
 def copy_grid(grid: Grid) -> Grid:
-    return [row.copy() for row in grid]
+    # Un seul memcpy contigu (la grille est déjà en uint8 depuis measure_generation)
+    return grid.copy()
 
 def count_chars(grid: Grid) -> Dict[str, int]:
-    return dict(Counter(ch for row in grid for ch in row))
+    counts = np.bincount(grid.ravel(), minlength=256)
+    return {ch: int(counts[ord(ch)]) for ch in (WALL, EMPTY, PATH, SEEN)}
 
 # ---------------------------------
 # Mesures
 # ---------------------------------
+PROC_STATUS = "/proc/self/status"
+PROC_CLEAR_REFS = "/proc/self/clear_refs"
+HAS_PROC_STATUS = os.path.exists(PROC_STATUS)  # vérifié une seule fois, pas à chaque mesure
+# ru_maxrss est en octets sous macOS, en kB ailleurs
+RU_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+def _proc_status_bytes(key: str) -> int:
+    """Lit un compteur mémoire de /proc/self/status (VmRSS, VmHWM...) en octets."""
+    with open(PROC_STATUS) as f:
+        for line in f:
+            if line.startswith(key + ":"):
+                return int(line.split()[1]) * 1024  # valeurs en kB
+    return 0
+
+def _reset_peak_rss() -> bool:
+    """Remet le pic RSS (VmHWM) du processus au RSS courant (Linux >= 4.0)."""
+    try:
+        with open(PROC_CLEAR_REFS, "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def _rss_bytes() -> int:
+    """Mémoire résidente hors Linux : pic ru_maxrss (getrusage), sinon RSS courant (psutil)."""
+    if resource is not None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RU_MAXRSS_UNIT
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    return 0
+
+def mem_start(precise: bool) -> Tuple[int, bool]:
+    """
+    Démarre la mesure mémoire ; retourne la référence à passer à mem_stop.
+    À appeler avant de prendre les temps de départ (son coût n'est pas mesuré).
+    """
+    if precise:
+        tracemalloc.start()
+        return 0, False
+    if not HAS_PROC_STATUS:
+        return _rss_bytes(), False
+    # Le pic RSS est cumulatif sur la vie du processus : on le remet à zéro pour
+    # qu'il ne reflète que l'appel mesuré (sinon : RSS courant avant/après)
+    hwm_reset = _reset_peak_rss()
+    return _proc_status_bytes("VmRSS"), hwm_reset
+
+def mem_stop(precise: bool, ref: Tuple[int, bool]) -> int:
+    """
+    Termine la mesure mémoire et retourne le pic (octets) depuis mem_start.
+    À appeler après avoir pris les temps de fin.
+    """
+    if precise:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return int(peak)
+    rss_before, hwm_reset = ref
+    if not HAS_PROC_STATUS:
+        return max(0, _rss_bytes() - rss_before)
+    after = _proc_status_bytes("VmHWM" if hwm_reset else "VmRSS")
+    return max(0, after - rss_before)
+
 @dataclass
 class GenMetrics:
     phase: str
@@ -100,18 +201,20 @@ class SolveMetrics:
     remaining_empty_cells: int
     wall_cells: int
 
-def measure_generation(gen_fn: Callable[[int], Grid], n: int, seed: int, label: str) -> Tuple[GenMetrics, Grid]:
+def measure_generation(gen_fn: Callable[[int], Grid], n: int, seed: int, label: str,
+                       precise_mem: bool = False) -> Tuple[GenMetrics, Grid]:
+    mem_ref = mem_start(precise_mem)
     start_cpu = time.process_time()
     start_wall = time.perf_counter()
-    tracemalloc.start()
     grid = gen_fn(n, seed=seed)
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
     end_wall = time.perf_counter()
     end_cpu = time.process_time()
+    peak = mem_stop(precise_mem, mem_ref)
 
+    grid = as_u8(grid)
     ascii_txt = grid_to_str(grid)
-    H, W = len(grid), len(grid[0]) if grid else (0, 0)
+    H = len(grid)
+    W = len(grid[0]) if H else 0
     gm = GenMetrics(
         phase="generation",
         algo=label,
@@ -126,16 +229,15 @@ def measure_generation(gen_fn: Callable[[int], Grid], n: int, seed: int, label:
     return gm, grid
 
 def measure_solving(solve_fn: Callable[[Grid], bool], grid_in: Grid, n: int, seed: int,
-                    label: str, gen_label: str) -> Tuple[SolveMetrics, Grid]:
+                    label: str, gen_label: str, precise_mem: bool = False) -> Tuple[SolveMetrics, Grid]:
     g = copy_grid(grid_in)
+    mem_ref = mem_start(precise_mem)
     start_cpu = time.process_time()
     start_wall = time.perf_counter()
-    tracemalloc.start()
     ok = solve_fn(g)
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
     end_wall = time.perf_counter()
     end_cpu = time.process_time()
+    peak = mem_stop(precise_mem, mem_ref)
 
     counts = count_chars(g)
     sm = SolveMetrics(
@@ -155,6 +257,54 @@ def measure_solving(solve_fn: Callable[[Grid], bool], grid_in: Grid, n: int, see
     )
     return sm, g
 
+def run_one(n: int, rep: int, reps: int, base_seed: int, gen_name: str, gen_fn: Callable[[int], Grid],
+            sol_map: Dict[str, Callable[[Grid], bool]], examples_dir: Optional[str] = None,
+            precise_mem: bool = False) -> Tuple[List[dict], List[str]]:
+    """
+    Un run indépendant : génération (n, rep, gen_name) puis chaque solveur sur la grille obtenue.
+    Autonome pour pouvoir s'exécuter dans un processus worker (mesure mémoire démarrée/arrêtée localement).
+    Retourne les lignes CSV et les messages à afficher en mode verbose.
+    """
+    rows: List[dict] = []
+    logs: List[str] = []
+
+    # Mesure génération
+    gm, grid = measure_generation(gen_fn, n, base_seed, label=f"gen_{gen_name}", precise_mem=precise_mem)
+    rows.append(asdict(gm))
+    logs.append(f"[GEN] n={n} rep={rep+1}/{reps} algo={gen_name} | "
+                f"wall={gm.wall_time_s:.4f}s cpu={gm.cpu_time_s:.4f}s mem={gm.peak_mem_bytes/1e6:.2f}MB")
+
+    # Sauvegarder exemple ASCII si demandé (seulement le premier solveur pour ne pas tout écraser)
+    saved_example = False
+
+    for sol_name, sol_fn in sol_map.items():
+        sm, solved = measure_solving(sol_fn, grid, n, base_seed,
+                                     label=f"solve_{sol_name}", gen_label=f"gen_{gen_name}",
+                                     precise_mem=precise_mem)
+        rows.append(asdict(sm))
+        logs.append(f"  [SOLVE] with {sol_name} | ok={sm.ok} "
+                    f"wall={sm.wall_time_s:.4f}s cpu={sm.cpu_time_s:.4f}s "
+                    f"mem={sm.peak_mem_bytes/1e6:.2f}MB path={sm.path_len_cells} explored={sm.explored_cells}")
+
+        if examples_dir and not saved_example:
+            # Fichier exemple : <examples_dir>/maze_n_<gen>_<sol>.txt
+            fname = os.path.join(examples_dir, f"maze_n{n}_{gen_name}_{sol_name}.txt")
+            with open(fname, "w", encoding="utf-8") as f:
+                f.write(grid_to_str(solved) + "\n")
+            saved_example = True
+
+    return rows, logs
+
+def warm_up(gen_map: Dict[str, Callable[[int], Grid]], sol_map: Dict[str, Callable[[Grid], bool]]) -> None:
+    """
+    Appelle une fois chaque générateur et solveur sur n=1, hors mesure : la compilation JIT
+    (ou le chargement du cache) numba n'est alors pas comptée dans le premier run du processus.
+    """
+    for gen_fn in gen_map.values():
+        grid = as_u8(gen_fn(1, seed=0))
+        for sol_fn in sol_map.values():
+            sol_fn(copy_grid(grid))
+
 # ---------------------------------
 # Main
 # ---------------------------------
@@ -183,6 +333,13 @@ def parse_args(argv=None):
                    help="Répertoire pour les exemples ASCII si --save_examples")
     p.add_argument("--verbose", action="store_true",
                    help="Affiche les mesures au fur et à mesure")
+    p.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                   help="Nombre de processus workers (1 = exécution séquentielle dans le processus courant)")
+    p.add_argument("--prefer-astar", action="store_true",
+                   help="Solveur astar : utiliser l'heuristique de Manhattan plutôt que le BFS par défaut")
+    p.add_argument("--precise-mem", action="store_true",
+                   help="Mesure la mémoire avec tracemalloc (par allocation, mais fausse les temps mesurés) "
+                        "au lieu du RSS de l'appel (/proc sous Linux, getrusage/psutil ailleurs)")
 
     # Modules à importer (si chemins custom)
     p.add_argument("--gen_module", type=str, default="maze_generator",
@@ -228,7 +385,10 @@ def main(argv=None):
             print("[WARN] Solveur backtracking introuvable dans", args.sol_module)
     if "astar" in args.solvers:
         if hasattr(sol_mod, "solve_astar"):
+            # Par défaut solve_astar fait un BFS (coûts unitaires) ; --prefer-astar force le vrai A*
             sol_map["astar"] = sol_mod.solve_astar
+            if args.prefer_astar:
+                sol_map["astar"] = partial(sol_mod.solve_astar, prefer_astar=True)
         else:
             print("[WARN] Solveur astar introuvable dans", args.sol_module)
 
@@ -246,68 +406,62 @@ def main(argv=None):
     if args.save_examples and not os.path.exists(args.examples_dir):
         os.makedirs(args.examples_dir, exist_ok=True)
 
-    # Boucle d'expériences
-    rows: List[dict] = []
-
-    run_id = 0
+    # Liste des runs indépendants (n, rep, générateur) ; les solveurs réutilisent la grille générée
+    tasks = []
     for n in args.sizes:
         for rep in range(args.reps):
             # Décaler la seed par run pour varier un peu
             base_seed = int(args.seed + 10007*rep + 7919*n)
-
             for gen_name, gen_fn in gen_map.items():
-                # Mesure génération
-                gm, grid = measure_generation(gen_fn, n, base_seed, label=f"gen_{gen_name}")
-                rows.append(asdict(gm))
-                if args.verbose:
-                    print(f"[GEN] n={n} rep={rep+1}/{args.reps} algo={gen_name} | "
-                          f"wall={gm.wall_time_s:.4f}s cpu={gm.cpu_time_s:.4f}s mem={gm.peak_mem_bytes/1e6:.2f}MB")
-
-                # Sauvegarder exemple ASCII si demandé (seulement le premier solveur pour ne pas tout écraser)
-                saved_example = False
-
-                for sol_name, sol_fn in sol_map.items():
-                    sm, solved = measure_solving(sol_fn, grid, n, base_seed,
-                                                 label=f"solve_{sol_name}", gen_label=f"gen_{gen_name}")
-                    rows.append(asdict(sm))
-                    if args.verbose:
-                        print(f"  [SOLVE] with {sol_name} | ok={sm.ok} "
-                              f"wall={sm.wall_time_s:.4f}s cpu={sm.cpu_time_s:.4f}s "
-                              f"mem={sm.peak_mem_bytes/1e6:.2f}MB path={sm.path_len_cells} explored={sm.explored_cells}")
-
-                    if args.save_examples and not saved_example:
-                        # Fichier exemple : <examples_dir>/maze_n_<gen>_<sol>.txt
-                        fname = os.path.join(args.examples_dir, f"maze_n{n}_{gen_name}_{sol_name}.txt")
-                        with open(fname, "w", encoding="utf-8") as f:
-                            f.write(grid_to_str(solved) + "\n")
-                        saved_example = True
-
-                run_id += 1
-
-    # Écriture CSV
-    fieldnames = sorted(set(k for row in rows for k in row.keys()))
+                # Exemples : premier run de chaque combinaison (évite que deux workers écrivent le même fichier)
+                examples_dir = args.examples_dir if args.save_examples and rep == 0 else None
+                tasks.append((n, rep, args.reps, base_seed, gen_name, gen_fn, sol_map, examples_dir,
+                              args.precise_mem))
+
+    # Colonnes CSV : union des champs des deux dataclasses (triée, comme auparavant)
+    fieldnames = sorted({f.name for f in fields(GenMetrics)} | {f.name for f in fields(SolveMetrics)})
+
+    # Résumé console calculé au fil de l'eau : (phase, algo, n) -> (nombre, somme des wall_time_s)
+    summary: Dict[Tuple[str, str, int], Tuple[int, float]] = {}
+    n_rows = 0
+
+    # Boucle d'expériences : chaque ligne est écrite dès sa réception (ordre des tâches)
     with open(out_path, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
-        for row in rows:
-            writer.writerow(row)
+
+        def collect(task_rows: List[dict], logs: List[str]) -> None:
+            nonlocal n_rows
+            for row in task_rows:
+                writer.writerow(row)
+                key = (row["phase"], row["algo"], row["n"])
+                count, total = summary.get(key, (0, 0.0))
+                summary[key] = (count + 1, total + float(row["wall_time_s"]))
+                n_rows += 1
+            f.flush()
+            if args.verbose:
+                for line in logs:
+                    print(line)
+
+        if args.jobs <= 1:
+            warm_up(gen_map, sol_map)
+            for task in tasks:
+                collect(*run_one(*task))
+        else:
+            # Chaque worker se préchauffe à son démarrage
+            with ProcessPoolExecutor(max_workers=args.jobs, initializer=warm_up,
+                                     initargs=(gen_map, sol_map)) as executor:
+                futures = [executor.submit(run_one, *task) for task in tasks]
+                for fut in futures:
+                    collect(*fut.result())
 
     print(f"\n✅ Résultats écrits dans: {out_path}")
-    print(f"  Total lignes: {len(rows)}")
+    print(f"  Total lignes: {n_rows}")
     # Petit résumé console
     # (on regroupe par phase+algo et on affiche la moyenne du wall time par taille)
-    try:
-        from statistics import mean
-        summary: Dict[Tuple[str,str,int], float] = {}
-        for row in rows:
-            key = (row.get("phase","?"), row.get("algo","?"), row.get("n",-1))
-            summary.setdefault(key, []).append(float(row.get("wall_time_s", 0.0)))
-        print("\nRésumé (moyenne wall_time_s par phase/algo/n):")
-        for (phase, algo, n), vals in sorted(summary.items()):
-            avg = mean(vals)
-            print(f"  {phase:10s} | {algo:24s} | n={n:5d} | mean wall={avg:.6f}s")
-    except Exception:
-        pass
+    print("\nRésumé (moyenne wall_time_s par phase/algo/n):")
+    for (phase, algo, n), (count, total) in sorted(summary.items()):
+        print(f"  {phase:10s} | {algo:24s} | n={n:5d} | mean wall={total / count:.6f}s")
 
     return 0
 
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+build_kernels.py
+================
+Compile ahead of time (numba.pycc) the numba kernels of maze_generator.py and
+maze_solver.py into a native extension module `maze_kernels`, written next to
+this file.
+
+When `maze_kernels` is importable, maze_generator.py and maze_solver.py use it
+instead of their @njit versions: no JIT compilation on the first call (which
+otherwise lands in the first wall_time_s measured by benchmarks.py).
+
+The compiled module is a snapshot of the kernel sources: re-run this script
+after editing any @njit kernel (or a constant/helper they use). Both modules
+ignore (with a warning) a maze_kernels file older than themselves, and the
+exported signatures only accept uint8 grids, which the solve_* entry points
+ensure.
+
+Usage
+-----
+$ python build_kernels.py
+"""
+
+import os
+
+from numba.pycc import CC
+
+import maze_generator
+import maze_solver
+
+cc = CC('maze_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Generators: (n, draws) -> grid, (n, shuffled edges) -> grid
+cc.export('carve_bt', 'u1[:,:](i8, u1[:])')(maze_generator._carve_bt.py_func)
+cc.export('kruskal', 'u1[:,:](i8, i4[:,:])')(maze_generator._kruskal_kernel.py_func)
+
+# Solvers: kernel(grid, sr, sc, er, ec) -> (found, ...) ; mark_path(grid, came_r, came_c, er, ec)
+DFS_SIG = 'Tuple((b1, b1[:,:], i4[:,:], i4[:,:]))(u1[:,:], i8, i8, i8, i8)'
+SEARCH_SIG = 'Tuple((b1, i4[:,:], i4[:,:], b1[:,:]))(u1[:,:], i8, i8, i8, i8)'
+cc.export('dfs', DFS_SIG)(maze_solver._dfs_kernel.py_func)
+cc.export('astar', SEARCH_SIG)(maze_solver._astar_kernel.py_func)
+cc.export('bfs', SEARCH_SIG)(maze_solver._bfs_kernel.py_func)
+cc.export('mark_path', 'void(u1[:,:], i4[:,:], i4[:,:], i8, i8)')(maze_solver._mark_path.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"✅ Module 'maze_kernels' compilé dans '{cc.output_dir}'")
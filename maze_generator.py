@@ -27,144 +27,204 @@ $ python maze_generator.py
 Le fichier ASCII sera écrit et contiendra le labyrinthe généré.
 """
 
-from typing import List, Tuple, Optional
-import random
+from typing import Optional
+import os
+import warnings
+
+import numpy as np
+from numba import njit
 
 WALL  = '#'
 EMPTY = '.'
 
-Grid = List[List[str]]
+# Codes ASCII utilisés dans les grilles numpy (uint8)
+WALL_U8  = ord(WALL)
+EMPTY_U8 = ord(EMPTY)
+
+# Directions (haut, bas, gauche, droite)
+DR = np.array([-1, 1, 0, 0], dtype=np.int32)
+DC = np.array([0, 0, -1, 1], dtype=np.int32)
+
+# Masques 4 bits de directions : nombre de bits à 1, et indice du j-ème bit à 1
+POPCOUNT = np.array([bin(m).count('1') for m in range(16)], dtype=np.int32)
+NTH_BIT = np.array([[d for d in range(4) if m >> d & 1] + [-1] * (4 - bin(m).count('1'))
+                    for m in range(16)], dtype=np.int32)
+
+# Grille (2n+1, 2n+1) de codes ASCII : 1 octet par case
+Grid = np.ndarray
 
 # -----------------------------
 # Utilitaires I/O
 # -----------------------------
+def grid_to_bytes(grid: Grid) -> bytes:
+    """Contenu ASCII du fichier : chaque ligne de la grille suivie de '\n', en un seul buffer."""
+    H, W = grid.shape
+    buf = np.empty((H, W + 1), np.uint8)
+    buf[:, :W] = grid
+    buf[:, W] = ord('\n')
+    return buf.tobytes()
+
 def grid_to_str(grid: Grid) -> str:
-    return '\n'.join(''.join(row) for row in grid)
+    return grid_to_bytes(grid)[:-1].decode('ascii')
 
 def save_grid(grid: Grid, filename: str) -> None:
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(grid_to_str(grid) + '\n')
+    with open(filename, 'wb') as f:
+        f.write(grid_to_bytes(grid))
 
 # -----------------------------
 # Helpers communs
 # -----------------------------
+@njit(cache=True)
 def make_blank_grid(n: int) -> Grid:
     """Crée une grille ASCII (2n+1)x(2n+1) remplie de murs '#', avec les centres de cellules en '.'"""
-    H, W = 2*n + 1, 2*n + 1
-    grid = [[WALL for _ in range(W)] for _ in range(H)]
-    for r in range(n):
-        for c in range(n):
-            gr, gc = 2*r + 1, 2*c + 1  # mapping cellule -> ASCII
-            grid[gr][gc] = EMPTY
+    grid = np.full((2*n + 1, 2*n + 1), WALL_U8, np.uint8)
+    grid[1::2, 1::2] = EMPTY_U8  # cellules aux coordonnées impaires (2r+1, 2c+1)
     return grid
 
+@njit(cache=True)
 def open_entry_exit(grid: Grid, n: int) -> None:
     """Ouvre l'entrée (haut au-dessus de (0,0)) et la sortie (bas au-dessous de (n-1,n-1))."""
-    H = len(grid)
+    H = grid.shape[0]
     # Entrée au-dessus de (0,0)
-    grid[0][1] = EMPTY
+    grid[0, 1] = EMPTY_U8
     # Sortie en bas sous (n-1,n-1) -> colonne ASCII = 2*(n-1)+1 = 2n-1
-    grid[H-1][2*n - 1] = EMPTY
+    grid[H-1, 2*n - 1] = EMPTY_U8
 
-def cell_to_grid(r: int, c: int) -> Tuple[int, int]:
-    """Convertit coordonnées cellule -> coordonnées ASCII (impaires)."""
-    return 2*r + 1, 2*c + 1
+def make_rng(seed: Optional[int] = None, rng: Optional[np.random.Generator] = None) -> np.random.Generator:
+    """Générateur aléatoire propre au run : rng fourni, sinon PCG64 initialisé avec seed (None -> entropie OS)."""
+    if rng is not None:
+        return rng
+    # default_rng accepte tout entier >= 0 (sans troncature) mais refuse les négatifs :
+    # comme random.seed, on utilise la valeur absolue pour les seeds négatives
+    return np.random.default_rng(None if seed is None else abs(seed))
 
 # -----------------------------
 # Générateur 1 : Recursive Backtracking
 # -----------------------------
-def carve_passages_recursive_backtracking(n: int, seed: Optional[int] = None) -> Grid:
-    if seed is not None:
-        random.seed(seed)
-
+@njit(cache=True)
+def _carve_bt(n: int, draws: np.ndarray) -> Grid:
+    """
+    DFS itératif compilé avec pile préallouée. À chaque étape, les voisins non visités
+    sont codés dans un masque 4 bits (bit d <-> direction d) et la direction est tirée
+    parmi les bits à 1 via les tables POPCOUNT / NTH_BIT.
+    draws : n*n tirages uniformes dans [0, 12) (un par cellule creusée) ; 12 étant
+    divisible par 1, 2, 3 et 4, draws[i] % POPCOUNT[mask] reste uniforme.
+    """
     grid = make_blank_grid(n)
-    visited = [[False]*n for _ in range(n)]
-
-    def neighbors(r: int, c: int):
-        dirs = [(-1,0),(1,0),(0,-1),(0,1)]
-        random.shuffle(dirs)
-        for dr, dc in dirs:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < n and 0 <= nc < n and not visited[nr][nc]:
-                yield nr, nc
-
-    def knock_between(r1: int, c1: int, r2: int, c2: int) -> None:
-        g1r, g1c = cell_to_grid(r1, c1)
-        g2r, g2c = cell_to_grid(r2, c2)
-        wr, wc = (g1r + g2r)//2, (g1c + g2c)//2
-        grid[wr][wc] = EMPTY
-
-    stack = [(0,0)]
-    visited[0][0] = True
-
-    while stack:
-        r, c = stack[-1]
-        progressed = False
-        for nr, nc in neighbors(r, c):
-            visited[nr][nc] = True
-            knock_between(r, c, nr, nc)
-            stack.append((nr, nc))
-            progressed = True
-            break
-        if not progressed:
-            stack.pop()
+    # visited avec une bordure sentinelle à True : cellule (r,c) stockée en (r+1,c+1),
+    # ce qui évite les tests de bornes lors du calcul du masque
+    visited = np.ones((n + 2, n + 2), np.bool_)
+    visited[1:n+1, 1:n+1] = False
+    stack = np.empty((n*n, 2), np.int32)
+
+    stack[0, 0] = 0
+    stack[0, 1] = 0
+    top = 1
+    visited[1, 1] = True
+    n_carved = 0
+
+    while top > 0:
+        r = stack[top - 1, 0]
+        c = stack[top - 1, 1]
+        mask = (np.int32(not visited[r, c + 1])              # haut
+                | np.int32(not visited[r + 2, c + 1]) << 1   # bas
+                | np.int32(not visited[r + 1, c]) << 2       # gauche
+                | np.int32(not visited[r + 1, c + 2]) << 3)  # droite
+        if mask == 0:
+            top -= 1
+            continue
+        d = NTH_BIT[mask, draws[n_carved] % POPCOUNT[mask]]
+        n_carved += 1
+        nr, nc = r + DR[d], c + DC[d]
+        visited[nr + 1, nc + 1] = True
+        # Mur entre (r,c) et (nr,nc) : milieu des deux cellules ASCII
+        grid[2*r + 1 + DR[d], 2*c + 1 + DC[d]] = EMPTY_U8
+        stack[top, 0] = nr
+        stack[top, 1] = nc
+        top += 1
 
     open_entry_exit(grid, n)
     return grid
 
+def carve_passages_recursive_backtracking(n: int, seed: Optional[int] = None,
+                                          rng: Optional[np.random.Generator] = None) -> Grid:
+    if n <= 0:
+        # Les noyaux numba ne vérifient pas les bornes : n <= 0 écrirait hors des tableaux sans erreur
+        raise ValueError(f"n doit être strictement positif (reçu {n}).")
+    draws = make_rng(seed, rng).integers(0, 12, size=n*n, dtype=np.uint8)
+    return _carve_bt_impl(n, draws)
+
 # -----------------------------
 # Générateur 2 : Kruskal (DSU)
 # -----------------------------
-class DSU:
-    def __init__(self, size: int):
-        self.parent = list(range(size))
-        self.rank = [0]*size
-    def find(self, x: int) -> int:
-        while self.parent[x] != x:
-            self.parent[x] = self.parent[self.parent[x]]
-            x = self.parent[x]
-        return x
-    def union(self, a: int, b: int) -> bool:
-        ra, rb = self.find(a), self.find(b)
-        if ra == rb:
-            return False
-        if self.rank[ra] < self.rank[rb]:
-            self.parent[ra] = rb
-        elif self.rank[ra] > self.rank[rb]:
-            self.parent[rb] = ra
-        else:
-            self.parent[rb] = ra
-            self.rank[ra] += 1
-        return True
-
-def carve_maze_kruskal(n: int, seed: Optional[int] = None) -> Grid:
-    if seed is not None:
-        random.seed(seed)
+@njit(cache=True)
+def _find(parent: np.ndarray, x: int) -> int:
+    while parent[x] != x:
+        parent[x] = parent[parent[x]]  # path halving
+        x = parent[x]
+    return x
+
+@njit(cache=True)
+def _union(parent: np.ndarray, rank: np.ndarray, a: int, b: int) -> bool:
+    ra, rb = _find(parent, a), _find(parent, b)
+    if ra == rb:
+        return False
+    if rank[ra] < rank[rb]:
+        parent[ra] = rb
+    elif rank[ra] > rank[rb]:
+        parent[rb] = ra
+    else:
+        parent[rb] = ra
+        rank[ra] += 1
+    return True
 
+@njit(cache=True)
+def _kruskal_kernel(n: int, edges: np.ndarray) -> Grid:
+    """Parcourt les arêtes (déjà mélangées) et casse le mur quand l'union réussit."""
     grid = make_blank_grid(n)
+    parent = np.arange(n*n).astype(np.int32)
+    rank = np.zeros(n*n, np.int32)
+    for i in range(edges.shape[0]):
+        r1, c1, r2, c2 = edges[i, 0], edges[i, 1], edges[i, 2], edges[i, 3]
+        if _union(parent, rank, r1*n + c1, r2*n + c2):
+            grid[r1 + r2 + 1, c1 + c2 + 1] = EMPTY_U8  # milieu des cellules ASCII
+    open_entry_exit(grid, n)
+    return grid
 
-    edges = []
-    for r in range(n):
-        for c in range(n):
-            if r+1 < n: edges.append((r,c,r+1,c))
-            if c+1 < n: edges.append((r,c,r,c+1))
-    random.shuffle(edges)
-
-    idx = lambda r, c: r*n + c
-    dsu = DSU(n*n)
+def carve_maze_kruskal(n: int, seed: Optional[int] = None,
+                       rng: Optional[np.random.Generator] = None) -> Grid:
+    if n <= 0:
+        # Les noyaux numba ne vérifient pas les bornes : n <= 0 écrirait hors des tableaux sans erreur
+        raise ValueError(f"n doit être strictement positif (reçu {n}).")
+    rng = make_rng(seed, rng)
 
-    def knock_between(r1: int, c1: int, r2: int, c2: int) -> None:
-        g1r, g1c = cell_to_grid(r1, c1)
-        g2r, g2c = cell_to_grid(r2, c2)
-        wr, wc = (g1r + g2r)//2, (g1c + g2c)//2
-        grid[wr][wc] = EMPTY
+    # Arêtes (r1, c1, r2, c2) : horizontales (c -> c+1) puis verticales (r -> r+1)
+    rs, cs = np.indices((n, n), dtype=np.int32)
+    h_edges = np.stack([rs[:, :-1], cs[:, :-1], rs[:, :-1], cs[:, :-1] + 1], axis=-1).reshape(-1, 4)
+    v_edges = np.stack([rs[:-1, :], cs[:-1, :], rs[:-1, :] + 1, cs[:-1, :]], axis=-1).reshape(-1, 4)
+    edges = np.concatenate([h_edges, v_edges])
+    edges = rng.permutation(edges)
 
-    for r1, c1, r2, c2 in edges:
-        if dsu.union(idx(r1,c1), idx(r2,c2)):
-            knock_between(r1,c1,r2,c2)
+    return _kruskal_impl(n, edges)
 
-    open_entry_exit(grid, n)
-    return grid
+# -----------------------------
+# Noyaux compilés à l'avance (optionnels)
+# -----------------------------
+# maze_kernels est construit par `python build_kernels.py` ; sans lui, on utilise les versions @njit
+try:
+    import maze_kernels as _aot
+except ImportError:
+    _aot = None
+# Un module compilé avant la dernière modification de ce fichier peut contenir d'anciens noyaux : on l'ignore
+if _aot is not None and os.path.getmtime(_aot.__file__) < os.path.getmtime(__file__):
+    warnings.warn("maze_kernels est plus ancien que maze_generator.py et est ignoré ; "
+                  "relancer `python build_kernels.py`.")
+    _aot = None
+
+if _aot is not None:
+    _carve_bt_impl, _kruskal_impl = _aot.carve_bt, _aot.kruskal
+else:
+    _carve_bt_impl, _kruskal_impl = _carve_bt, _kruskal_kernel
 
 # -----------------------------
 # CLI (mode interactif)
@@ -5,7 +5,7 @@ maze_solver.py
 ==============
 Solve a maze in ASCII format using either:
 - Recursive Backtracking (DFS)
-- A* (Manhattan)
+- Shortest path: BFS by default (unit step costs), or A* (Manhattan) on request
 
 Conventions
 -----------
@@ -27,45 +27,63 @@ Run the script and answer prompts:
 """
 
 from typing import List, Tuple, Optional
-import heapq
-import sys
-
-WALL = '#'
-EMPTY = '.'
-PATH = 'o'
-SEEN = '*'
+import functools
+import os
+import warnings
+
+import numpy as np
+from numba import njit
+
+# Cell codes (ASCII bytes stored in a uint8 grid)
+WALL = ord('#')
+EMPTY = ord('.')
+PATH = ord('o')
+SEEN = ord('*')
 Coord = Tuple[int, int]
-Grid = List[List[str]]
-sys.setrecursionlimit(10000)
+Grid = np.ndarray  # shape (H, W), dtype uint8
+
+# Neighbor offsets, in exploration order: up, down, left, right
+DR = np.array([-1, 1, 0, 0], dtype=np.int32)
+DC = np.array([0, 0, -1, 1], dtype=np.int32)
+INF = np.iinfo(np.int32).max
 # --------------------
 # I/O utilities
 # --------------------
 def read_grid(filename: str) -> Grid:
-    """Read an ASCII maze file into a list of list of chars."""
-    with open(filename, 'r', encoding='utf-8') as f:
-        lines = f.read().splitlines()
-    # Keep exact characters; don't strip spaces; ensure list of list
-    return [list(line) for line in lines if line != '']
+    """Read an ASCII maze file into a 2D uint8 array (one ASCII code per cell)."""
+    with open(filename, 'rb') as f:
+        lines = [line for line in f.read().splitlines() if line]
+    # Keep exact characters; don't strip spaces; rows must share the same width
+    W = len(lines[0])
+    return np.frombuffer(b''.join(lines), dtype=np.uint8).reshape(-1, W).copy()
+
+def to_char_lists(grid: Grid) -> List[List[str]]:
+    """Convert a uint8 grid to a list of list of chars (legacy API)."""
+    return grid.view('S1').astype('U1').tolist()
 
 def save_grid(grid: Grid, filename: str) -> None:
-    """Write the maze grid back to a text file."""
-    with open(filename, 'w', encoding='utf-8') as f:
-        for row in grid:
-            f.write(''.join(row) + '\n')
+    """Write the maze grid back to a text file in a single binary write."""
+    # Append a '\n' column so the whole file is one contiguous buffer
+    H, W = grid.shape
+    buf = np.empty((H, W + 1), np.uint8)
+    buf[:, :W] = grid
+    buf[:, W] = ord('\n')
+    with open(filename, 'wb') as f:
+        f.write(buf.tobytes())
 
 def find_entry_exit(grid: Grid) -> Tuple[Coord, Coord]:
     """Find entry (first '.' on top row) and exit (first '.' from right on bottom row)."""
-    H, W = len(grid), len(grid[0])
+    H, W = grid.shape
 
     entry: Optional[Coord] = None
     for c in range(W):
-        if grid[0][c] == EMPTY:
+        if grid[0, c] == EMPTY:
             entry = (0, c)
             break
 
     exit_: Optional[Coord] = None
     for c in range(W - 1, -1, -1):
-        if grid[H - 1][c] == EMPTY:
+        if grid[H - 1, c] == EMPTY:
             exit_ = (H - 1, c)
             break
 
@@ -74,16 +92,90 @@ def find_entry_exit(grid: Grid) -> Tuple[Coord, Coord]:
 
     return entry, exit_
 
-def neighbors4(r: int, c: int):
-    """Yield 4-neighbors (up, down, left, right)."""
-    yield r - 1, c
-    yield r + 1, c
-    yield r, c - 1
-    yield r, c + 1
+def _on_uint8_grid(solve):
+    """
+    Run a solver on a uint8 version of 'grid' (the dtype the compiled kernels expect),
+    copying the result back when a conversion was needed so 'grid' is still mutated in-place.
+    Also accepts the legacy list of lists of chars, whose rows are updated with the result.
+    """
+    @functools.wraps(solve)
+    def wrapper(grid: Grid, *args, **kwargs) -> bool:
+        if isinstance(grid, np.ndarray):
+            work = np.asarray(grid, dtype=np.uint8)
+        else:
+            work = np.array([[ord(ch) for ch in row] for row in grid], dtype=np.uint8)
+        ok = solve(work, *args, **kwargs)
+        if work is grid:
+            return ok
+        if isinstance(grid, np.ndarray):
+            grid[...] = work
+        else:
+            for row, chars in zip(grid, to_char_lists(work)):
+                row[:] = chars
+        return ok
+    return wrapper
+
+def mark_explored(grid: Grid, explored: np.ndarray) -> None:
+    """Mark every explored '.' cell as SEEN in one vectorized write."""
+    grid[explored & (grid == EMPTY)] = SEEN
+
+@njit(cache=True)
+def _mark_path(grid: Grid, came_r: np.ndarray, came_c: np.ndarray, er: int, ec: int) -> None:
+    """Walk came_r/came_c back from the goal to the start, marking cells as PATH."""
+    r, c = er, ec
+    while r != -1:
+        grid[r, c] = PATH
+        r, c = came_r[r, c], came_c[r, c]
 
 # --------------------
 # Backtracking (DFS)
 # --------------------
+@njit(cache=True)
+def _dfs_kernel(grid: Grid, sr: int, sc: int, er: int, ec: int):
+    """
+    Iterative DFS over a uint8 grid, exploring neighbors in DR/DC order
+    (up, down, left, right) like the former recursive version.
+    Returns (found, visited, came_r, came_c); came_r/came_c hold each cell's parent or -1.
+    """
+    H, W = grid.shape
+    came_r = np.full((H, W), -1, np.int32)
+    came_c = np.full((H, W), -1, np.int32)
+    visited = np.zeros((H, W), np.bool_)
+    # Explicit stack of (r, c, index of the next direction to try)
+    stack = np.empty((H * W, 3), np.int32)
+
+    visited[sr, sc] = True
+    if sr == er and sc == ec:
+        return True, visited, came_r, came_c
+    stack[0, 0] = sr
+    stack[0, 1] = sc
+    stack[0, 2] = 0
+    top = 1
+
+    while top > 0:
+        r = stack[top - 1, 0]
+        c = stack[top - 1, 1]
+        k = stack[top - 1, 2]
+        if k == 4:
+            top -= 1
+            continue
+        stack[top - 1, 2] = k + 1
+        nr = r + DR[k]
+        nc = c + DC[k]
+        if 0 <= nr < H and 0 <= nc < W and not visited[nr, nc] and grid[nr, nc] == EMPTY:
+            visited[nr, nc] = True
+            came_r[nr, nc] = r
+            came_c[nr, nc] = c
+            if nr == er and nc == ec:
+                return True, visited, came_r, came_c
+            stack[top, 0] = nr
+            stack[top, 1] = nc
+            stack[top, 2] = 0
+            top += 1
+
+    return False, visited, came_r, came_c
+
+@_on_uint8_grid
 def solve_backtracking(grid: Grid) -> bool:
     """
     Solve the maze using DFS backtracking.
@@ -92,124 +184,189 @@ def solve_backtracking(grid: Grid) -> bool:
       - overwrites final path cells as 'o' (PATH)
     Returns True if a path was found, False otherwise.
     """
-    H, W = len(grid), len(grid[0])
+    H, W = grid.shape
     (sr, sc), (er, ec) = find_entry_exit(grid)
 
     def is_empty(r: int, c: int) -> bool:
-        return 0 <= r < H and 0 <= c < W and grid[r][c] == EMPTY
+        return 0 <= r < H and 0 <= c < W and grid[r, c] == EMPTY
 
     # Start just inside the maze (below entry) if possible; target just above exit
     start = (1, sc) if sr == 0 and is_empty(1, sc) else (sr, sc)
     goal = (H - 2, ec) if er == H - 1 and is_empty(H - 2, ec) else (er, ec)
 
-    visited = [[False] * W for _ in range(H)]
-    parent: dict[Coord, Coord] = {}
-
-    found = False
-
-    def dfs(r: int, c: int) -> None:
-        nonlocal found
-        if found:
-            return
-        visited[r][c] = True
-        if (r, c) == goal:
-            found = True
-            return
-        for nr, nc in neighbors4(r, c):
-            if 0 <= nr < H and 0 <= nc < W and not visited[nr][nc] and grid[nr][nc] == EMPTY:
-                parent[(nr, nc)] = (r, c)
-                dfs(nr, nc)
-                if found:
-                    return
-
-    if is_empty(start[0], start[1]):
-        dfs(start[0], start[1])
-    else:
+    if not is_empty(start[0], start[1]):
         return False
 
-    # Mark explored cells as SEEN
-    for r in range(H):
-        for c in range(W):
-            if visited[r][c] and grid[r][c] == EMPTY:
-                grid[r][c] = SEEN
+    found, visited, came_r, came_c = _dfs_impl(grid, start[0], start[1], goal[0], goal[1])
 
+    # Explored cells are marked even when no path exists
+    mark_explored(grid, visited)
     if not found:
         return False
 
-    # Reconstruct final path and mark as PATH
-    cur = goal
-    while cur != start:
-        r, c = cur
-        grid[r][c] = PATH
-        cur = parent[cur]
-    # Mark start too
-    grid[start[0]][start[1]] = PATH
-
+    _mark_path_impl(grid, came_r, came_c, goal[0], goal[1])
     return True
 
 # --------------------
 # A* (Manhattan)
 # --------------------
-def solve_astar(grid: Grid) -> bool:
+@njit(cache=True)
+def _astar_kernel(grid: Grid, sr: int, sc: int, er: int, ec: int):
+    """
+    A* open-list loop over a uint8 grid.
+    With unit steps and the (consistent) Manhattan heuristic, f never decreases,
+    so the open list is a monotone bucket queue indexed by f: each bucket is a
+    LIFO linked list stored in preallocated node arrays.
+    Returns (found, came_r, came_c, closed).
+    """
+    H, W = grid.shape
+    g_score = np.full((H, W), INF, np.int32)
+    came_r = np.full((H, W), -1, np.int32)
+    came_c = np.full((H, W), -1, np.int32)
+    closed = np.zeros((H, W), np.bool_)
+
+    # g <= H*W and h <= H+W, hence f <= max_f
+    max_f = H * W + H + W
+    head = np.full(max_f + 1, -1, np.int32)
+    # Each expanded cell pushes at most 4 nodes
+    cap = H * W * 4 + 1
+    node_g = np.empty(cap, np.int32)
+    node_r = np.empty(cap, np.int32)
+    node_c = np.empty(cap, np.int32)
+    node_next = np.empty(cap, np.int32)
+
+    g_score[sr, sc] = 0
+    cur_f = abs(sr - er) + abs(sc - ec)
+    node_g[0], node_r[0], node_c[0], node_next[0] = 0, sr, sc, -1
+    head[cur_f] = 0
+    n_nodes = 1
+
+    while True:
+        # Advance to the smallest non-empty bucket
+        while cur_f <= max_f and head[cur_f] == -1:
+            cur_f += 1
+        if cur_f > max_f:
+            break
+        node = head[cur_f]
+        head[cur_f] = node_next[node]
+        g, r, c = node_g[node], node_r[node], node_c[node]
+        if closed[r, c]:
+            continue
+        closed[r, c] = True
+
+        if r == er and c == ec:
+            return True, came_r, came_c, closed
+
+        tentative_g = g + 1
+        for k in range(4):
+            nr = r + DR[k]
+            nc = c + DC[k]
+            if not (0 <= nr < H and 0 <= nc < W) or grid[nr, nc] != EMPTY:
+                continue
+            if tentative_g < g_score[nr, nc]:
+                g_score[nr, nc] = tentative_g
+                came_r[nr, nc] = r
+                came_c[nr, nc] = c
+                # Manhattan heuristic, inlined
+                f = tentative_g + abs(nr - er) + abs(nc - ec)
+                node_g[n_nodes], node_r[n_nodes], node_c[n_nodes] = tentative_g, nr, nc
+                node_next[n_nodes] = head[f]
+                head[f] = n_nodes
+                n_nodes += 1
+
+    return False, came_r, came_c, closed
+
+@njit(cache=True)
+def _bfs_kernel(grid: Grid, sr: int, sc: int, er: int, ec: int):
+    """
+    Breadth-first search over a uint8 grid with an int32 FIFO queue.
+    Returns (found, came_r, came_c, closed) like _astar_kernel.
+    """
+    H, W = grid.shape
+    came_r = np.full((H, W), -1, np.int32)
+    came_c = np.full((H, W), -1, np.int32)
+    discovered = np.zeros((H, W), np.bool_)
+    closed = np.zeros((H, W), np.bool_)
+    # Each cell is enqueued at most once
+    queue = np.empty((H * W, 2), np.int32)
+
+    discovered[sr, sc] = True
+    queue[0, 0] = sr
+    queue[0, 1] = sc
+    q_head, q_tail = 0, 1
+
+    while q_head < q_tail:
+        r = queue[q_head, 0]
+        c = queue[q_head, 1]
+        q_head += 1
+        closed[r, c] = True
+
+        if r == er and c == ec:
+            return True, came_r, came_c, closed
+
+        for k in range(4):
+            nr = r + DR[k]
+            nc = c + DC[k]
+            if not (0 <= nr < H and 0 <= nc < W) or grid[nr, nc] != EMPTY:
+                continue
+            if not discovered[nr, nc]:
+                discovered[nr, nc] = True
+                came_r[nr, nc] = r
+                came_c[nr, nc] = c
+                queue[q_tail, 0] = nr
+                queue[q_tail, 1] = nc
+                q_tail += 1
+
+    return False, came_r, came_c, closed
+
+@_on_uint8_grid
+def solve_astar(grid: Grid, prefer_astar: bool = False) -> bool:
     """
-    Solve the maze using A* with Manhattan heuristic.
+    Solve the maze with a shortest-path search.
+    Every step costs 1, so by default this runs a plain BFS (same shortest path,
+    no priority queue); prefer_astar=True uses A* with Manhattan heuristic instead.
     Mutates 'grid' in-place:
       - marks explored '.' as '*' (SEEN)
       - overwrites final path cells as 'o' (PATH)
     Returns True if a path was found, False otherwise.
     """
-    H, W = len(grid), len(grid[0])
+    H, W = grid.shape
     (sr, sc), (er, ec) = find_entry_exit(grid)
 
     def is_empty(r: int, c: int) -> bool:
-        return 0 <= r < H and 0 <= c < W and grid[r][c] == EMPTY
+        return 0 <= r < H and 0 <= c < W and grid[r, c] == EMPTY
 
     # Start just inside the maze (below entry) if possible; target just above exit
     start = (1, sc) if sr == 0 and is_empty(1, sc) else (sr, sc)
     goal = (H - 2, ec) if er == H - 1 and is_empty(H - 2, ec) else (er, ec)
 
-    def h(a: Coord, b: Coord) -> int:
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-    open_heap: list[tuple[int, int, Coord]] = []
-    heapq.heappush(open_heap, (h(start, goal), 0, start))
-
-    came: dict[Coord, Optional[Coord]] = {start: None}
-    g_score: dict[Coord, int] = {start: 0}
-    closed: set[Coord] = set()
+    kernel = _astar_impl if prefer_astar else _bfs_impl
+    found, came_r, came_c, closed = kernel(grid, start[0], start[1], goal[0], goal[1])
+    if not found:
+        return False
 
-    while open_heap:
-        f, g, cur = heapq.heappop(open_heap)
-        if cur in closed:
-            continue
-        closed.add(cur)
-
-        if cur == goal:
-            # Mark explored
-            for (r, c) in closed:
-                if grid[r][c] == EMPTY:
-                    grid[r][c] = SEEN
-            # Reconstruct path
-            node = cur
-            while node is not None:
-                r, c = node
-                grid[r][c] = PATH
-                node = came[node]
-            return True
-
-        r, c = cur
-        for nr, nc in neighbors4(r, c):
-            if not (0 <= nr < H and 0 <= nc < W):
-                continue
-            if grid[nr][nc] != EMPTY:
-                continue
-            tentative_g = g + 1
-            if (nr, nc) not in g_score or tentative_g < g_score[(nr, nc)]:
-                g_score[(nr, nc)] = tentative_g
-                came[(nr, nc)] = cur
-                heapq.heappush(open_heap, (tentative_g + h((nr, nc), goal), tentative_g, (nr, nc)))
+    mark_explored(grid, closed)
+    _mark_path_impl(grid, came_r, came_c, goal[0], goal[1])
+    return True
 
-    return False
+# --------------------
+# Ahead-of-time compiled kernels (optional)
+# --------------------
+# maze_kernels is built by `python build_kernels.py`; without it, the @njit versions are used
+try:
+    import maze_kernels as _aot
+except ImportError:
+    _aot = None
+# A module built before this file was last edited may hold stale kernels: ignore it
+if _aot is not None and os.path.getmtime(_aot.__file__) < os.path.getmtime(__file__):
+    warnings.warn("maze_kernels is older than maze_solver.py and is ignored; "
+                  "re-run `python build_kernels.py`.")
+    _aot = None
+
+if _aot is not None:
+    _dfs_impl, _astar_impl, _bfs_impl, _mark_path_impl = _aot.dfs, _aot.astar, _aot.bfs, _aot.mark_path
+else:
+    _dfs_impl, _astar_impl, _bfs_impl, _mark_path_impl = _dfs_kernel, _astar_kernel, _bfs_kernel, _mark_path
 
 # --------------------
 # Small CLI